@@ -7,6 +7,7 @@ import logging
 from .config import AppConfig
 from .logging_utils import configure_logging
 from .pipeline import build_processed_artifacts, refresh_raw_snapshots
+from .storage import migrate_csv_artifacts
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     subparsers.add_parser("refresh-raw", help="Sync raw Investtech snapshots into data/raw/investtech/.")
     subparsers.add_parser("build", help="Rebuild processed dashboard artifacts into data/processed/.")
+    subparsers.add_parser("migrate-artifacts", help="Convert legacy CSV artifacts in data/processed/ to Parquet.")
     return parser
 
 
@@ -37,6 +39,8 @@ def main(argv: list[str] | None = None) -> int:
     elif args.command == "build":
         build_result = build_processed_artifacts(config)
         result = {"written": str(config.processed_dir), "summary": build_result["summary"]}
+    elif args.command == "migrate-artifacts":
+        result = {"migrated": migrate_csv_artifacts(config)}
     else:
         parser.error(f"Unsupported command: {args.command}")
         return 2
@@ -40,3 +40,7 @@ class AppConfig:
     @property
     def processed_dir(self) -> Path:
         return self.data_root / "processed"
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.data_root / "cache"
@@ -1,10 +1,11 @@
 import pandas as pd
 
 from .config import AppConfig
-from .plotting import plot_calibration, plot_strategy_curves, plot_threshold_history
-from .storage import load_dashboard_bundle
+from .plotting import plot_calibration, plot_strategy_curves, plot_threshold_history, select_mapping_rows
+from .storage import ARTIFACT_NAMES, load_dashboard_bundle, processed_artifact_path
 
 st = None
+_cached_load_bundle = None
 
 
 def _get_streamlit():
@@ -16,6 +17,32 @@ def _get_streamlit():
     return st
 
 
+def _get_cached_load_bundle():
+    global _cached_load_bundle
+    if _cached_load_bundle is None:
+        _cached_load_bundle = _get_streamlit().cache_data(show_spinner=False)(_load_bundle)
+    return _cached_load_bundle
+
+
+def _artifact_signature(config: AppConfig) -> tuple:
+    signature = []
+    for name in ARTIFACT_NAMES:
+        path = processed_artifact_path(config, name)
+        legacy_path = path.with_suffix(".csv")
+        signature.append((name, path.stat().st_mtime_ns if path.exists() else None))
+        signature.append((legacy_path.name, legacy_path.stat().st_mtime_ns if legacy_path.exists() else None))
+    return tuple(signature)
+
+
+def _load_bundle(processed_dir: str, artifact_signature: tuple, _config: AppConfig) -> dict:
+    return load_dashboard_bundle(_config)
+
+
+def _load_cached_bundle(config: AppConfig) -> dict:
+    # Keyed on artifact mtimes so a rebuild invalidates the cached bundle on the next rerun.
+    return _get_cached_load_bundle()(str(config.processed_dir), _artifact_signature(config), config)
+
+
 def _format_percent(value: float) -> str:
     if pd.isna(value):
         return "n/a"
@@ -147,9 +174,7 @@ def _render_evaluation(evaluation_df: pd.DataFrame) -> None:
 
 def _render_calibration_table(calibration_df: pd.DataFrame, signal_name: str, horizon_label: str) -> None:
     streamlit = _get_streamlit()
-    subset = calibration_df[
-        (calibration_df["signal_name"] == signal_name) & (calibration_df["horizon_label"] == horizon_label)
-    ].copy()
+    subset = select_mapping_rows(calibration_df, signal_name, horizon_label)
     if subset.empty:
         streamlit.info("No calibration rows are available for this mapping.")
         return
@@ -189,7 +214,7 @@ def main() -> None:
     streamlit = _get_streamlit()
     streamlit.set_page_config(page_title="Investtech Decision Dashboard", layout="wide")
     config = AppConfig.from_env()
-    bundle = load_dashboard_bundle(config)
+    bundle = _load_cached_bundle(config)
 
     if not bundle["summary"]:
         streamlit.error(
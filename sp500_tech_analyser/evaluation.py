@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from datetime import date, datetime
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
 from .constants import (
@@ -13,54 +13,66 @@ from .constants import (
     STRATEGY_COLUMNS,
     SignalMapping,
 )
-
-
-def classify_return(value: float) -> str:
-    if pd.isna(value):
-        return "Flat"
-    if value > 0:
-        return "Up"
-    if value < 0:
-        return "Down"
-    return "Flat"
-
-
-def classify_position(value: int) -> str:
-    if value > 0:
-        return "Up"
-    if value < 0:
-        return "Down"
-    return "Flat"
-
-
-def determine_position(score: float, threshold: int) -> int:
-    if pd.isna(score):
-        return 0
-    if score > threshold:
-        return 1
-    if score < -threshold:
-        return -1
-    return 0
-
-
-def fit_optimal_threshold(train_df: pd.DataFrame, thresholds: Iterable[int]) -> dict:
-    diagnostics = []
-    for threshold in thresholds:
-        positions = train_df["score"].apply(lambda score: determine_position(score, threshold))
-        strategy_returns = positions * train_df["forward_return"]
-        cumulative_return = float((1.0 + strategy_returns).prod() - 1.0)
-        active_mask = positions != 0
-        directional_accuracy = float(
-            (positions[active_mask].map(classify_position) == train_df.loc[active_mask, "true_label"]).mean()
-        ) if active_mask.any() else 0.0
-        diagnostics.append(
-            {
-                "threshold": threshold,
-                "cumulative_return": cumulative_return,
-                "coverage": float(active_mask.mean()),
-                "directional_accuracy": directional_accuracy,
-            }
-        )
+from .market import normalize_market_sessions
+
+LABEL_DTYPE = pd.CategoricalDtype(["Down", "Flat", "Up"], ordered=True)
+LABEL_COLUMNS = ["predicted_label", "true_label"]
+
+
+def classify_returns(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return np.select([values > 0, values < 0], ["Up", "Down"], default="Flat").astype(object)
+
+
+def classify_positions(positions: np.ndarray) -> np.ndarray:
+    return np.select([positions > 0, positions < 0], ["Up", "Down"], default="Flat").astype(object)
+
+
+def determine_positions(scores: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    return np.where(scores > thresholds, 1, np.where(scores < -thresholds, -1, 0))
+
+
+def _expanding_threshold_stats(
+    scores: np.ndarray,
+    forward_returns: np.ndarray,
+    true_labels: np.ndarray,
+    thresholds: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    positions = determine_positions(scores[:, None], thresholds)
+    growth = positions * forward_returns[:, None]
+    growth += 1.0
+    growth[np.isnan(growth)] = 1.0
+    active = positions != 0
+    hits = ((positions > 0) & (true_labels == "Up")[:, None]) | ((positions < 0) & (true_labels == "Down")[:, None])
+
+    # Row k of each output covers the first k observations, so row 0 is the empty prefix.
+    shape = (len(scores) + 1, len(thresholds))
+    cumulative_returns = np.zeros(shape)
+    active_counts = np.zeros(shape, dtype=int)
+    hit_counts = np.zeros(shape, dtype=int)
+    np.cumprod(growth, axis=0, out=cumulative_returns[1:])
+    cumulative_returns[1:] -= 1.0
+    np.cumsum(active, axis=0, out=active_counts[1:])
+    np.cumsum(hits, axis=0, out=hit_counts[1:])
+    return cumulative_returns, active_counts, hit_counts
+
+
+def _select_threshold(
+    thresholds: list[int],
+    cumulative_returns: np.ndarray,
+    active_counts: np.ndarray,
+    hit_counts: np.ndarray,
+    observations: int,
+) -> dict:
+    diagnostics = [
+        {
+            "threshold": threshold,
+            "cumulative_return": float(cumulative_returns[index]),
+            "coverage": float(active_counts[index] / observations) if observations else float("nan"),
+            "directional_accuracy": float(hit_counts[index] / active_counts[index]) if active_counts[index] else 0.0,
+        }
+        for index, threshold in enumerate(thresholds)
+    ]
 
     best = max(
         diagnostics,
@@ -73,12 +85,19 @@ def fit_optimal_threshold(train_df: pd.DataFrame, thresholds: Iterable[int]) ->
     return best
 
 
-def _precision_recall(df: pd.DataFrame, label: str) -> tuple[float, float]:
-    predicted = df["predicted_label"] == label
-    actual = df["true_label"] == label
-    true_positive = int((predicted & actual).sum())
-    precision = true_positive / int(predicted.sum()) if predicted.sum() else 0.0
-    recall = true_positive / int(actual.sum()) if actual.sum() else 0.0
+def _confusion_matrix(predicted_codes: np.ndarray, true_codes: np.ndarray) -> np.ndarray:
+    # Rows are predicted labels and columns are true labels, both in LABEL_DTYPE category order.
+    size = len(LABEL_DTYPE.categories)
+    return np.bincount(predicted_codes * size + true_codes, minlength=size * size).reshape(size, size)
+
+
+def _precision_recall(confusion: np.ndarray, label: str) -> tuple[float, float]:
+    code = LABEL_DTYPE.categories.get_loc(label)
+    true_positive = int(confusion[code, code])
+    predicted = int(confusion[code].sum())
+    actual = int(confusion[:, code].sum())
+    precision = true_positive / predicted if predicted else 0.0
+    recall = true_positive / actual if actual else 0.0
     return float(precision), float(recall)
 
 
@@ -90,25 +109,18 @@ def _max_drawdown(equity_curve: pd.Series) -> float:
     return float(drawdown.min())
 
 
-def _safe_pearson_correlation(left: pd.Series, right: pd.Series) -> float:
-    if len(left) <= 1 or len(right) <= 1:
+def _safe_pearson_correlation(left: np.ndarray, right: np.ndarray) -> float:
+    valid = ~(np.isnan(left) | np.isnan(right))
+    left = left[valid]
+    right = right[valid]
+    if len(left) <= 1 or (left == left[0]).all() or (right == right[0]).all():
         return 0.0
-    left_clean = pd.Series(left, dtype=float)
-    right_clean = pd.Series(right, dtype=float)
-    if left_clean.nunique(dropna=True) <= 1 or right_clean.nunique(dropna=True) <= 1:
+    left = left - left.mean()
+    right = right - right.mean()
+    denominator = np.sqrt(np.dot(left, left) * np.dot(right, right))
+    if not denominator:
         return 0.0
-    correlation = left_clean.corr(right_clean)
-    return float(correlation) if pd.notna(correlation) else 0.0
-
-
-def _normalize_session_date(value) -> date | None:
-    if pd.isna(value):
-        return None
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, date):
-        return value
-    return pd.to_datetime(value).date()
+    return float(np.clip(np.dot(left, right) / denominator, -1.0, 1.0))
 
 
 def _overlapping_strategy_metrics(oos_df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
@@ -124,6 +136,7 @@ def _overlapping_strategy_metrics(oos_df: pd.DataFrame) -> tuple[pd.DataFrame, d
     overlapping["trade_entry_date"] = pd.NaT
     overlapping["trade_exit_date"] = pd.NaT
     overlapping = overlapping[STRATEGY_COLUMNS]
+    overlapping[LABEL_COLUMNS] = overlapping[LABEL_COLUMNS].astype(LABEL_DTYPE)
 
     metrics = {
         "executed_trade_count": int((overlapping["position"] != 0).sum()),
@@ -135,29 +148,21 @@ def _overlapping_strategy_metrics(oos_df: pd.DataFrame) -> tuple[pd.DataFrame, d
 
 
 def _simulate_non_overlapping_trades(oos_df: pd.DataFrame, market_sessions: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
-    sessions = market_sessions.copy()
-    sessions["session_date"] = pd.to_datetime(sessions["session_date"]).dt.date
-    sessions = sessions.sort_values("session_date").drop_duplicates("session_date", keep="last").reset_index(drop=True)
+    sessions = normalize_market_sessions(market_sessions)
     sessions["daily_return"] = sessions["close"].pct_change().fillna(0.0)
-    sessions["session_index"] = sessions.index
-    session_to_index = dict(zip(sessions["session_date"], sessions["session_index"]))
+    session_lookup = pd.Index(sessions["session_date"])
 
     candidates = oos_df.copy()
-    candidates["base_session_date"] = candidates["base_session_date"].map(_normalize_session_date)
-    candidates["future_session_date"] = candidates["future_session_date"].map(_normalize_session_date)
-    candidates["base_index"] = candidates["base_session_date"].map(session_to_index)
-    candidates["future_index"] = candidates["future_session_date"].map(session_to_index)
-    candidates["entry_index"] = candidates["base_index"].apply(
-        lambda value: int(value) + 1 if pd.notna(value) else None
-    )
-    candidates["tradable"] = False
-    comparable = candidates["entry_index"].notna() & candidates["future_index"].notna()
-    candidates.loc[comparable, "tradable"] = (
-        candidates.loc[comparable, "entry_index"].astype(int)
-        <= candidates.loc[comparable, "future_index"].astype(int)
-    )
-
-    tradable = candidates[candidates["tradable"]].copy().reset_index(drop=True)
+    candidates["base_session_date"] = pd.to_datetime(candidates["base_session_date"]).dt.date
+    candidates["future_session_date"] = pd.to_datetime(candidates["future_session_date"]).dt.date
+    base_positions = session_lookup.get_indexer(candidates["base_session_date"])
+    future_positions = session_lookup.get_indexer(candidates["future_session_date"])
+    candidates["base_index"] = np.where(base_positions >= 0, base_positions, np.nan)
+    candidates["future_index"] = np.where(future_positions >= 0, future_positions, np.nan)
+    candidates["entry_index"] = candidates["base_index"] + 1
+    candidates["tradable"] = (base_positions >= 0) & (future_positions >= 0) & (base_positions + 1 <= future_positions)
+
+    tradable = candidates[candidates["tradable"]].reset_index(drop=True)
     if tradable.empty:
         return pd.DataFrame(columns=STRATEGY_COLUMNS), {
             "executed_trade_count": 0,
@@ -168,53 +173,35 @@ def _simulate_non_overlapping_trades(oos_df: pd.DataFrame, market_sessions: pd.D
 
     start_index = int(tradable["entry_index"].min())
     end_index = int(tradable["future_index"].max())
-    backtest_sessions = sessions.iloc[start_index : end_index + 1].copy()
-    backtest_sessions["strategy_daily_return"] = 0.0
-
-    executed_rows = []
+    session_dates = sessions["session_date"].to_numpy()
+    daily_returns = sessions["daily_return"].to_numpy()
+    strategy_daily_returns = np.zeros(len(sessions))
+
+    positions = tradable["position"].to_numpy()
+    entry_indices = tradable["entry_index"].to_numpy(dtype=int)
+    exit_indices = tradable["future_index"].to_numpy(dtype=int)
+    executed = []
+    strategy_returns = []
+    benchmark_returns = []
     active_until_index = -1
-    for row in tradable.itertuples(index=False):
-        entry_index = int(row.entry_index)
-        exit_index = int(row.future_index)
-        if row.position == 0 or entry_index <= active_until_index:
+    for row_index, (position, entry_index, exit_index) in enumerate(zip(positions, entry_indices, exit_indices)):
+        if position == 0 or entry_index <= active_until_index:
             continue
 
-        window = sessions.iloc[entry_index : exit_index + 1]
-        strategy_window_returns = row.position * window["daily_return"]
-        strategy_return = float((1.0 + strategy_window_returns).prod() - 1.0)
-        benchmark_return = float((1.0 + window["daily_return"]).prod() - 1.0)
-
-        mask = (backtest_sessions["session_index"] >= entry_index) & (backtest_sessions["session_index"] <= exit_index)
-        backtest_sessions.loc[mask, "strategy_daily_return"] = row.position * backtest_sessions.loc[mask, "daily_return"]
-
-        executed_rows.append(
-            {
-                "snapshot_at": row.snapshot_at,
-                "provider": row.provider,
-                "term": row.term,
-                "signal_name": row.signal_name,
-                "horizon_label": row.horizon_label,
-                "score": row.score,
-                "forward_return": row.forward_return,
-                "threshold": row.threshold,
-                "position": row.position,
-                "predicted_label": row.predicted_label,
-                "true_label": row.true_label,
-                "base_session_date": row.base_session_date,
-                "future_session_date": row.future_session_date,
-                "trade_entry_date": sessions.iloc[entry_index]["session_date"],
-                "trade_exit_date": sessions.iloc[exit_index]["session_date"],
-                "strategy_return": strategy_return,
-                "benchmark_return": benchmark_return,
-                "_trade_exit_index": exit_index,
-            }
-        )
+        window_returns = daily_returns[entry_index : exit_index + 1]
+        strategy_window_returns = position * window_returns
+        strategy_returns.append(float((1.0 + strategy_window_returns).prod() - 1.0))
+        benchmark_returns.append(float((1.0 + window_returns).prod() - 1.0))
+        strategy_daily_returns[entry_index : exit_index + 1] = strategy_window_returns
+        executed.append(row_index)
         active_until_index = exit_index
 
+    backtest_sessions = sessions.iloc[start_index : end_index + 1].copy()
+    backtest_sessions["strategy_daily_return"] = strategy_daily_returns[start_index : end_index + 1]
     backtest_sessions["cumulative_strategy_equity"] = (1.0 + backtest_sessions["strategy_daily_return"]).cumprod()
     backtest_sessions["cumulative_buy_hold_equity"] = (1.0 + backtest_sessions["daily_return"]).cumprod()
 
-    if not executed_rows:
+    if not executed:
         metrics = {
             "executed_trade_count": 0,
             "cumulative_strategy_return": float(backtest_sessions["cumulative_strategy_equity"].iloc[-1] - 1.0),
@@ -223,18 +210,17 @@ def _simulate_non_overlapping_trades(oos_df: pd.DataFrame, market_sessions: pd.D
         }
         return pd.DataFrame(columns=STRATEGY_COLUMNS), metrics
 
-    executed_df = pd.DataFrame(executed_rows)
-    equity_lookup = backtest_sessions.set_index("session_index")[
-        ["cumulative_strategy_equity", "cumulative_buy_hold_equity"]
-    ]
-    executed_df["cumulative_strategy_equity"] = executed_df["_trade_exit_index"].map(
-        equity_lookup["cumulative_strategy_equity"]
-    )
-    executed_df["cumulative_buy_hold_equity"] = executed_df["_trade_exit_index"].map(
-        equity_lookup["cumulative_buy_hold_equity"]
-    )
-    executed_df = executed_df.drop(columns=["_trade_exit_index"])
+    executed_df = tradable.iloc[executed].reset_index(drop=True)
+    executed_df["trade_entry_date"] = session_dates[entry_indices[executed]]
+    executed_df["trade_exit_date"] = session_dates[exit_indices[executed]]
+    executed_df["strategy_return"] = strategy_returns
+    executed_df["benchmark_return"] = benchmark_returns
+    # Backtest sessions start at start_index, so exit positions index straight into the equity curves.
+    exit_offsets = exit_indices[executed] - start_index
+    executed_df["cumulative_strategy_equity"] = backtest_sessions["cumulative_strategy_equity"].to_numpy()[exit_offsets]
+    executed_df["cumulative_buy_hold_equity"] = backtest_sessions["cumulative_buy_hold_equity"].to_numpy()[exit_offsets]
     executed_df = executed_df[STRATEGY_COLUMNS].sort_values("snapshot_at").reset_index(drop=True)
+    executed_df[LABEL_COLUMNS] = executed_df[LABEL_COLUMNS].astype(LABEL_DTYPE)
 
     metrics = {
         "executed_trade_count": int(len(executed_df)),
@@ -264,32 +250,23 @@ def build_calibration_rows(oos_df: pd.DataFrame, mapping: SignalMapping) -> pd.D
         }
     )
     if not oos_df.empty:
-        bucketed = oos_df.copy()
-        bucketed["bucket"] = pd.cut(
-            bucketed["score"],
-            bins=CALIBRATION_BINS,
-            labels=CALIBRATION_BUCKETS,
-            include_lowest=True,
-            right=True,
+        scores = oos_df["score"].to_numpy(dtype=float)
+        forward_returns = oos_df["forward_return"].to_numpy(dtype=float)
+        # Buckets are closed on the right, with the lowest edge included; out-of-range scores are dropped.
+        in_range = (scores >= CALIBRATION_BINS[0]) & (scores <= CALIBRATION_BINS[-1])
+        buckets = np.digitize(scores[in_range], CALIBRATION_BINS[1:-1], right=True)
+        returns = forward_returns[in_range]
+        observed = ~np.isnan(returns)
+        bucket_count = len(CALIBRATION_BUCKETS)
+        row_count = np.bincount(buckets, minlength=bucket_count)
+        sample_count = np.bincount(buckets[observed], minlength=bucket_count)
+        return_sum = np.bincount(buckets[observed], weights=returns[observed], minlength=bucket_count)
+        hit_count = np.bincount(buckets, weights=returns > 0, minlength=bucket_count)
+        calibration["forward_return_average"] = np.divide(
+            return_sum, sample_count, out=np.zeros(bucket_count), where=sample_count > 0
         )
-        grouped = (
-            bucketed.dropna(subset=["bucket"])
-            .groupby("bucket", observed=False)
-            .agg(
-                forward_return_average=("forward_return", "mean"),
-                hit_rate=("forward_return", lambda values: float((values > 0).mean())),
-                sample_count=("forward_return", "count"),
-            )
-            .reset_index()
-        )
-        calibration = calibration.drop(columns=["forward_return_average", "hit_rate", "sample_count"]).merge(
-            grouped,
-            on="bucket",
-            how="left",
-        )
-        calibration["forward_return_average"] = calibration["forward_return_average"].fillna(0.0)
-        calibration["hit_rate"] = calibration["hit_rate"].fillna(0.0)
-        calibration["sample_count"] = calibration["sample_count"].fillna(0).astype(int)
+        calibration["hit_rate"] = np.divide(hit_count, row_count, out=np.zeros(bucket_count), where=row_count > 0)
+        calibration["sample_count"] = sample_count
 
     calibration.insert(0, "horizon_label", mapping.horizon_label)
     calibration.insert(0, "term", mapping.term)
@@ -314,7 +291,7 @@ def evaluate_signal_mapping(
     )
     total_observations = len(subset)
     labeled = subset[subset["label_available"]].copy().reset_index(drop=True)
-    labeled["true_label"] = labeled["forward_return"].apply(classify_return)
+    labeled["true_label"] = pd.Categorical(classify_returns(labeled["forward_return"].to_numpy()), dtype=LABEL_DTYPE)
 
     warnings: list[str] = []
     missing_labels = total_observations - len(labeled)
@@ -360,39 +337,55 @@ def evaluate_signal_mapping(
             warnings,
         )
 
-    strategy_rows = []
-    for position_index in range(min_train_size, len(labeled)):
-        train_df = labeled.iloc[:position_index]
-        test_row = labeled.iloc[position_index].copy()
-        diagnostic = fit_optimal_threshold(train_df, thresholds=thresholds)
-        threshold = int(diagnostic["threshold"])
-        position = determine_position(float(test_row["score"]), threshold)
-        strategy_return = float(position * test_row["forward_return"])
-        benchmark_return = float(test_row["forward_return"])
-        strategy_rows.append(
-            {
-                **test_row.to_dict(),
-                "threshold": threshold,
-                "position": position,
-                "predicted_label": classify_position(position),
-                "true_label": test_row["true_label"],
-                "strategy_return": strategy_return,
-                "benchmark_return": benchmark_return,
-            }
-        )
-
-    oos_df = pd.DataFrame(strategy_rows)
+    thresholds = list(thresholds)
+    scores = labeled["score"].to_numpy(dtype=float)
+    forward_returns = labeled["forward_return"].to_numpy(dtype=float)
+    cumulative_returns, active_counts, hit_counts = _expanding_threshold_stats(
+        scores,
+        forward_returns,
+        labeled["true_label"].to_numpy(),
+        np.asarray(thresholds, dtype=float),
+    )
+    selected_thresholds = np.array(
+        [
+            int(
+                _select_threshold(
+                    thresholds,
+                    cumulative_returns[position_index],
+                    active_counts[position_index],
+                    hit_counts[position_index],
+                    position_index,
+                )["threshold"]
+            )
+            for position_index in range(min_train_size, len(labeled))
+        ]
+    )
+    positions = determine_positions(scores[min_train_size:], selected_thresholds)
+    test_returns = forward_returns[min_train_size:]
+
+    oos_df = labeled.iloc[min_train_size:].reset_index(drop=True)
+    oos_df["threshold"] = selected_thresholds
+    oos_df["position"] = positions
+    oos_df["predicted_label"] = classify_positions(positions)
+    oos_df["strategy_return"] = positions * test_returns
+    oos_df["benchmark_return"] = test_returns
+    oos_df[LABEL_COLUMNS] = oos_df[LABEL_COLUMNS].astype(LABEL_DTYPE)
     if market_sessions is None:
         strategies_df, strategy_metrics = _overlapping_strategy_metrics(oos_df)
     else:
         strategies_df, strategy_metrics = _simulate_non_overlapping_trades(oos_df, market_sessions)
 
-    active_mask = oos_df["position"] != 0
-    directional_accuracy = float(
-        (oos_df.loc[active_mask, "predicted_label"] == oos_df.loc[active_mask, "true_label"]).mean()
-    ) if active_mask.any() else 0.0
-    precision_up, recall_up = _precision_recall(oos_df, "Up")
-    precision_down, recall_down = _precision_recall(oos_df, "Down")
+    confusion = _confusion_matrix(
+        oos_df["predicted_label"].cat.codes.to_numpy(dtype=np.intp),
+        oos_df["true_label"].cat.codes.to_numpy(dtype=np.intp),
+    )
+    directional = np.arange(len(LABEL_DTYPE.categories)) != LABEL_DTYPE.categories.get_loc("Flat")
+    active_count = int(confusion[directional].sum())
+    directional_accuracy = (
+        float(np.trace(confusion[directional][:, directional]) / active_count) if active_count else 0.0
+    )
+    precision_up, recall_up = _precision_recall(confusion, "Up")
+    precision_down, recall_down = _precision_recall(confusion, "Down")
     cumulative_strategy_return = strategy_metrics["cumulative_strategy_return"]
     cumulative_buy_hold_return = strategy_metrics["cumulative_buy_hold_return"]
     verdict = determine_verdict(
@@ -410,8 +403,11 @@ def evaluate_signal_mapping(
         "executed_trade_count": int(strategy_metrics["executed_trade_count"]),
         "labeled_observations": int(len(labeled)),
         "total_observations": int(total_observations),
-        "coverage": float(active_mask.mean()),
-        "pearson_correlation": _safe_pearson_correlation(oos_df["score"], oos_df["forward_return"]),
+        "coverage": float(active_count / len(oos_df)),
+        "pearson_correlation": _safe_pearson_correlation(
+            oos_df["score"].to_numpy(dtype=float),
+            oos_df["forward_return"].to_numpy(dtype=float),
+        ),
         "directional_accuracy": directional_accuracy,
         "precision_up": precision_up,
         "recall_up": recall_up,
@@ -1,27 +1,41 @@
 from __future__ import annotations
 
-from bisect import bisect_left
-from datetime import date, datetime, time
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Sequence
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
+from .storage import read_parquet_with_metadata, write_parquet_atomic
+
+logger = logging.getLogger(__name__)
+
 MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+# Requested start of the cached history, so a start date that is not a session still counts as covered.
+BENCHMARK_CACHE_START_KEY = b"sp500_tech_analyser.covered_from"
+# Relative change in a re-fetched close that means yfinance has re-based its adjusted history.
+ADJUSTED_CLOSE_RTOL = 1e-6
 
 
-def fetch_benchmark_history(ticker: str, start_date: date, end_date: date) -> pd.DataFrame:
+def _download_benchmark_history(ticker: str, start_date: date, end_date: date) -> pd.DataFrame:
     import yfinance as yf
 
     data = yf.download(
         tickers=ticker,
         start=start_date.isoformat(),
-        end=(end_date + pd.Timedelta(days=2)).isoformat(),
+        end=end_date.isoformat(),
         interval="1d",
         progress=False,
         auto_adjust=False,
     )
     if data.empty:
-        raise ValueError(f"No benchmark data returned for {ticker}.")
+        return pd.DataFrame(columns=["session_date", "close"])
 
     if isinstance(data.columns, pd.MultiIndex):
         if "Adj Close" in data.columns.get_level_values(0):
@@ -40,28 +54,137 @@ def fetch_benchmark_history(ticker: str, start_date: date, end_date: date) -> pd
     sessions = close.rename("close").reset_index()
     date_column = sessions.columns[0]
     sessions["session_date"] = pd.to_datetime(sessions[date_column]).dt.date
-    sessions = sessions[["session_date", "close"]].dropna()
-    sessions = sessions.drop_duplicates(subset=["session_date"], keep="last").sort_values("session_date")
-    sessions.reset_index(drop=True, inplace=True)
-    return sessions
-
-
-def resolve_base_session(snapshot_at: datetime, session_dates: list[date]) -> date | None:
-    local_time = snapshot_at.astimezone(MARKET_TZ)
-    candidate = local_time.date()
-    market_close = datetime.combine(candidate, time(hour=16), tzinfo=MARKET_TZ)
-    if candidate in session_dates and local_time >= market_close:
-        return candidate
-    index = bisect_left(session_dates, candidate) - 1
-    if index < 0:
-        return None
-    return session_dates[index]
+    return sessions[["session_date", "close"]].dropna()
 
 
-def resolve_future_session(base_session_date: date, target_date: date, session_dates: list[date]) -> date | None:
-    if base_session_date is None:
-        return None
-    index = bisect_left(session_dates, target_date)
-    if index >= len(session_dates):
+def benchmark_cache_path(cache_dir: Path, ticker: str) -> Path:
+    return cache_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)}_1d.parquet"
+
+
+def _read_benchmark_cache(cache_path: Path) -> tuple[pd.DataFrame, date | None] | None:
+    cached = read_parquet_with_metadata(cache_path)
+    if cached is None:
         return None
-    return session_dates[index]
+    sessions, metadata = cached
+    covered_from = metadata.get(BENCHMARK_CACHE_START_KEY)
+    if covered_from is not None:
+        return sessions, date.fromisoformat(covered_from.decode())
+    return sessions, sessions["session_date"].min() if not sessions.empty else None
+
+
+def _write_benchmark_cache(cache_path: Path, sessions: pd.DataFrame, covered_from: date) -> None:
+    write_parquet_atomic(cache_path, sessions, {BENCHMARK_CACHE_START_KEY: covered_from.isoformat().encode()})
+
+
+def _closes_match(cached: pd.DataFrame, tail: pd.DataFrame, session_date: date) -> bool:
+    cached_close = cached.loc[cached["session_date"] == session_date, "close"]
+    tail_close = tail.loc[tail["session_date"] == session_date, "close"]
+    if cached_close.empty or tail_close.empty:
+        return False
+    return bool(np.isclose(tail_close.iloc[-1], cached_close.iloc[-1], rtol=ADJUSTED_CLOSE_RTOL, atol=0.0))
+
+
+def _written_after_close(cache_path: Path, session_date: date) -> bool:
+    written_at = datetime.fromtimestamp(cache_path.stat().st_mtime, tz=MARKET_TZ)
+    return written_at >= datetime.combine(session_date, MARKET_CLOSE, tzinfo=MARKET_TZ)
+
+
+def _cache_is_current(cache_path: Path, last_cached: date, download_end: date) -> bool:
+    if not _written_after_close(cache_path, last_cached):
+        return False
+    next_session = np.busday_offset(np.datetime64(last_cached, "D"), 1, roll="forward").astype(date)
+    if next_session >= download_end:
+        return True
+    return datetime.now(MARKET_TZ) < datetime.combine(next_session, MARKET_OPEN, tzinfo=MARKET_TZ)
+
+
+def fetch_benchmark_history(
+    ticker: str,
+    start_date: date,
+    end_date: date,
+    cache_dir: Path | None = None,
+) -> pd.DataFrame:
+    download_end = end_date + timedelta(days=2)
+    cache_path = benchmark_cache_path(cache_dir, ticker) if cache_dir is not None else None
+    cached, covered_from = None, None
+    if cache_path is not None and cache_path.exists():
+        cached, covered_from = _read_benchmark_cache(cache_path) or (None, None)
+
+    if cached is None or cached.empty or covered_from is None or covered_from > start_date:
+        sessions = _download_benchmark_history(ticker, start_date, download_end)
+        covered_from = start_date
+    elif _cache_is_current(cache_path, cached["session_date"].max(), download_end):
+        logger.debug("Cached %s history is current; skipping download", ticker)
+        sessions = cached
+    else:
+        # Re-fetch from the session before the last cached one: its close must still match, otherwise a
+        # dividend or split has re-based the adjusted history. The last close is refreshed in case it was
+        # captured mid-session.
+        last_cached = cached["session_date"].iloc[-1]
+        anchor = cached["session_date"].iloc[-2] if len(cached) > 1 else last_cached
+        logger.debug("Extending cached %s history from %s", ticker, anchor)
+        tail = _download_benchmark_history(ticker, anchor, download_end)
+        if tail.empty:
+            sessions = cached
+        elif not _closes_match(cached, tail, anchor):
+            logger.info("Adjusted %s closes changed since they were cached; downloading full history", ticker)
+            sessions = _download_benchmark_history(ticker, covered_from, download_end)
+        elif tail["session_date"].max() <= last_cached and _written_after_close(cache_path, last_cached):
+            # Nothing traded after the final cached close (e.g. an exchange holiday), so keep the cache as is.
+            logger.debug("No %s sessions after %s; cached history is current", ticker, last_cached)
+            sessions = cached
+        else:
+            sessions = pd.concat([cached, tail], ignore_index=True)
+
+    if sessions.empty:
+        raise ValueError(f"No benchmark data returned for {ticker}.")
+
+    if sessions is not cached:
+        sessions = sessions.drop_duplicates(subset=["session_date"], keep="last").sort_values("session_date")
+        sessions.reset_index(drop=True, inplace=True)
+    if cache_path is not None and sessions is not cached:
+        _write_benchmark_cache(cache_path, sessions, covered_from)
+        logger.debug("Cached %s benchmark session row(s) in %s", len(sessions), cache_path)
+
+    in_range = (sessions["session_date"] >= start_date) & (sessions["session_date"] < download_end)
+    return sessions[in_range].reset_index(drop=True)
+
+
+def normalize_market_sessions(market_sessions: pd.DataFrame) -> pd.DataFrame:
+    sessions = market_sessions.copy()
+    session_days = pd.to_datetime(sessions["session_date"]).dt.normalize()
+    sessions["session_date"] = session_days.dt.date
+    if not (session_days.is_monotonic_increasing and session_days.is_unique):
+        sessions = sessions.sort_values("session_date").drop_duplicates("session_date", keep="last")
+    return sessions.reset_index(drop=True)
+
+
+def _session_days(session_dates: Sequence[date]) -> np.ndarray:
+    return np.asarray(session_dates, dtype="datetime64[D]")
+
+
+def resolve_base_session_indices(snapshot_at: pd.Series, session_dates: Sequence[date]) -> np.ndarray:
+    local_time = pd.to_datetime(snapshot_at, utc=True).dt.tz_convert(MARKET_TZ)
+    candidate = local_time.dt.tz_localize(None).dt.normalize().to_numpy().astype("datetime64[D]")
+    after_close = (local_time.dt.hour >= 16).to_numpy()
+    cutoff = np.where(after_close, candidate, candidate - np.timedelta64(1, "D"))
+    base_indices = np.searchsorted(_session_days(session_dates), cutoff, side="right") - 1
+    # NaT sorts after every session, so missing times would otherwise resolve to the last one.
+    return np.where(np.isnat(cutoff), -1, base_indices)
+
+
+def resolve_future_session_indices(
+    base_indices: np.ndarray,
+    horizon_deltas: Sequence[timedelta],
+    session_dates: Sequence[date],
+) -> np.ndarray:
+    days = _session_days(session_dates)
+    offsets = np.array([delta.days for delta in horizon_deltas], dtype="timedelta64[D]")
+    future_indices = np.full((len(base_indices), len(offsets)), -1)
+    has_base = base_indices >= 0
+    if not has_base.any():
+        return future_indices
+    targets = days[base_indices[has_base]][:, None] + offsets
+    resolved = np.searchsorted(days, targets, side="left")
+    future_indices[has_base] = np.where(resolved < len(days), resolved, -1)
+    return future_indices
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 import logging
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from .config import AppConfig
@@ -16,122 +18,201 @@ from .constants import (
     STRATEGY_COLUMNS,
 )
 from .evaluation import evaluate_signal_mapping
-from .market import fetch_benchmark_history, resolve_base_session, resolve_future_session
+from .market import (
+    fetch_benchmark_history,
+    normalize_market_sessions,
+    resolve_base_session_indices,
+    resolve_future_session_indices,
+)
 from .providers.investtech import InvesttechProvider
 from .storage import (
     bootstrap_legacy_raw_history,
     ensure_directories,
     format_utc_timestamp,
+    list_raw_snapshot_paths,
     load_raw_snapshot_payloads,
-    parse_utc_timestamp,
     processed_artifact_path,
+    read_parquet_with_metadata,
     sync_raw_snapshots_from_gcs,
     upload_raw_snapshot_to_gcs,
     write_dataframe,
     write_json,
     write_local_raw_snapshot,
+    write_parquet_atomic,
 )
 
 logger = logging.getLogger(__name__)
 
+RAW_TERM_ITEMS = tuple(RAW_TERM_KEYS.items())
+SNAPSHOT_TEXT_FIELDS = ("recommendation", "analysis", "conclusion", "special")
+SNAPSHOT_FIELDS = ("score", *SNAPSHOT_TEXT_FIELDS)
+RAW_SNAPSHOT_CACHE_NAME = "raw_snapshot_rows.parquet"
+# Bump whenever _raw_snapshot_rows changes what it derives, so cached rows are rebuilt from the raw files.
+RAW_SNAPSHOT_CACHE_VERSION = 1
+
+
+def _raw_snapshot_rows(payloads: list[tuple[Path, dict]], provider_name: str) -> pd.DataFrame:
+    wide = pd.json_normalize([payload for _, payload in payloads])
+    snapshot_at = pd.to_datetime(wide["datetime"], utc=True, format="mixed")
+    source_paths = [str(source_path) for source_path, _ in payloads]
+    source_mtimes = [source_path.stat().st_mtime_ns for source_path, _ in payloads]
+    term_frames = []
+    for term, raw_key in RAW_TERM_ITEMS:
+        term_frame = wide.reindex(columns=[f"{raw_key}.{field}" for field in SNAPSHOT_FIELDS])
+        term_frame.columns = list(SNAPSHOT_FIELDS)
+        text_columns = list(SNAPSHOT_TEXT_FIELDS)
+        term_frame[text_columns] = term_frame[text_columns].astype(object).where(term_frame[text_columns].notna(), None)
+        term_frame.insert(0, "term", term)
+        term_frame.insert(0, "provider", provider_name)
+        term_frame.insert(0, "snapshot_at", snapshot_at)
+        term_frame["_source_path"] = source_paths
+        term_frame["_source_mtime_ns"] = source_mtimes
+        term_frames.append(term_frame)
+    return pd.concat(term_frames, ignore_index=True)
+
+
+def _raw_snapshot_cache_metadata(provider_name: str) -> dict[bytes, bytes]:
+    return {
+        b"sp500_tech_analyser.cache_version": str(RAW_SNAPSHOT_CACHE_VERSION).encode(),
+        b"sp500_tech_analyser.provider": provider_name.encode(),
+    }
 
-def normalize_raw_snapshots(config: AppConfig) -> pd.DataFrame:
-    payloads = load_raw_snapshot_payloads(config)
-    rows = []
-    for source_path, payload in payloads:
-        snapshot_at = parse_utc_timestamp(payload["datetime"])
-        for term, raw_key in RAW_TERM_KEYS.items():
-            block = payload.get(raw_key) or {}
-            rows.append(
-                {
-                    "snapshot_at": snapshot_at,
-                    "provider": config.provider_name,
-                    "term": term,
-                    "score": block.get("score"),
-                    "recommendation": block.get("recommendation"),
-                    "analysis": block.get("analysis"),
-                    "conclusion": block.get("conclusion"),
-                    "special": block.get("special"),
-                    "_source_path": str(source_path),
-                }
-            )
 
-    if not rows:
+def _write_cached_raw_snapshot_rows(cache_path: Path, rows: pd.DataFrame, provider_name: str) -> None:
+    write_parquet_atomic(cache_path, rows, metadata=_raw_snapshot_cache_metadata(provider_name))
+    logger.debug("Cached %s raw snapshot row(s) in %s", len(rows), cache_path)
+
+
+def _load_cached_raw_snapshot_rows(
+    cache_path: Path,
+    source_mtimes: dict[str, int],
+    provider_name: str,
+) -> pd.DataFrame | None:
+    if not cache_path.exists():
+        return None
+    loaded = read_parquet_with_metadata(cache_path)
+    if loaded is None:
+        return None
+    cached, metadata = loaded
+    expected = _raw_snapshot_cache_metadata(provider_name)
+    if any(metadata.get(key) != value for key, value in expected.items()):
+        logger.info("Discarding raw snapshot cache %s written by a different version or provider", cache_path)
+        return None
+    # Rows from deleted or rewritten files are dropped so those files get parsed again.
+    current = cached["_source_path"].map(source_mtimes) == cached["_source_mtime_ns"]
+    return cached[current]
+
+
+def normalize_raw_snapshots(config: AppConfig) -> pd.DataFrame:
+    paths = list_raw_snapshot_paths(config)
+    if not paths:
         return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
 
-    snapshots = pd.DataFrame(rows).sort_values(["snapshot_at", "provider", "term", "_source_path"])
-    snapshots["snapshot_at"] = pd.to_datetime(snapshots["snapshot_at"], utc=True)
+    source_mtimes = {str(path): path.stat().st_mtime_ns for path in paths}
+    cache_path = config.cache_dir / RAW_SNAPSHOT_CACHE_NAME
+    cached = _load_cached_raw_snapshot_rows(cache_path, source_mtimes, config.provider_name)
+    cached_paths = set(cached["_source_path"]) if cached is not None else set()
+    payloads = load_raw_snapshot_payloads(config, [path for path in paths if str(path) not in cached_paths])
+
+    row_frames = [cached] if cached is not None and not cached.empty else []
+    if payloads:
+        row_frames.append(_raw_snapshot_rows(payloads, config.provider_name))
+    rows = pd.concat(row_frames, ignore_index=True)
+    if payloads or len(cached_paths) != len(source_mtimes):
+        _write_cached_raw_snapshot_rows(cache_path, rows, config.provider_name)
+
+    snapshots = rows.sort_values(["snapshot_at", "provider", "term", "_source_path"])
     snapshots = snapshots.drop_duplicates(subset=["snapshot_at", "provider", "term"], keep="last")
     normalized = snapshots[SNAPSHOT_COLUMNS].reset_index(drop=True)
+    normalized["recommendation"] = normalized["recommendation"].astype("category")
     logger.info(
-        "Normalized %s raw row(s) into %s snapshot row(s)",
+        "Normalized %s raw row(s) into %s snapshot row(s); parsed %s new file(s)",
         len(rows),
         len(normalized),
+        len(payloads),
     )
     return normalized
 
 
+def _take_or_none(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    taken = np.full(indices.shape, None, dtype=object)
+    valid = indices >= 0
+    taken[valid] = values[indices[valid]]
+    return taken
+
+
+def _take_or_nan(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    taken = np.full(indices.shape, np.nan)
+    valid = indices >= 0
+    taken[valid] = values[indices[valid]]
+    return taken
+
+
 def build_signal_frame(snapshots_df: pd.DataFrame, market_sessions: pd.DataFrame) -> pd.DataFrame:
     if snapshots_df.empty:
         return pd.DataFrame(columns=SIGNAL_COLUMNS)
 
-    market_sessions = market_sessions.copy()
-    market_sessions["session_date"] = pd.to_datetime(market_sessions["session_date"]).dt.date
-    market_sessions = market_sessions.sort_values("session_date").drop_duplicates("session_date", keep="last")
+    market_sessions = normalize_market_sessions(market_sessions)
 
-    session_dates = market_sessions["session_date"].tolist()
-    close_by_date = dict(zip(session_dates, market_sessions["close"]))
+    session_dates = market_sessions["session_date"].to_numpy()
+    closes = market_sessions["close"].to_numpy(dtype=float)
 
-    rows = []
-    for mapping in SIGNAL_MAPPINGS:
-        term_rows = snapshots_df[snapshots_df["term"] == mapping.term].copy()
-        for snapshot in term_rows.itertuples(index=False):
-            snapshot_at = snapshot.snapshot_at
-            if isinstance(snapshot_at, pd.Timestamp):
-                if snapshot_at.tzinfo is None:
-                    snapshot_at = snapshot_at.tz_localize("UTC").to_pydatetime()
-                else:
-                    snapshot_at = snapshot_at.to_pydatetime()
-            else:
-                if snapshot_at.tzinfo is None:
-                    snapshot_at = snapshot_at.replace(tzinfo=timezone.utc)
-
-            base_session_date = resolve_base_session(snapshot_at, session_dates)
-            future_session_date = None
-            base_close = None
-            future_close = None
-            forward_return = None
-            if base_session_date is not None:
-                target_date = base_session_date + mapping.horizon_delta
-                future_session_date = resolve_future_session(base_session_date, target_date, session_dates)
-                if future_session_date is not None:
-                    base_close = float(close_by_date[base_session_date])
-                    future_close = float(close_by_date[future_session_date])
-                    forward_return = float((future_close - base_close) / base_close)
-
-            rows.append(
+    # Resolve every horizon for every distinct snapshot time at once: one column per signal mapping.
+    # Term rows share their snapshot's timestamp, so results are broadcast back through the inverse codes.
+    snapshot_at = pd.to_datetime(snapshots_df["snapshot_at"], utc=True)
+    snapshot_codes, unique_snapshot_at = pd.factorize(snapshot_at, use_na_sentinel=False)
+    unique_base_indices = resolve_base_session_indices(pd.Series(unique_snapshot_at), session_dates)
+    unique_future_indices = resolve_future_session_indices(
+        unique_base_indices,
+        [mapping.horizon_delta for mapping in SIGNAL_MAPPINGS],
+        session_dates,
+    )
+    unique_base_close = _take_or_nan(
+        closes, np.where(unique_future_indices >= 0, unique_base_indices[:, None], -1)
+    )
+    unique_future_close = _take_or_nan(closes, unique_future_indices)
+    unique_forward_returns = np.subtract(unique_future_close, unique_base_close)
+    np.divide(unique_forward_returns, unique_base_close, out=unique_forward_returns)
+
+    base_close = unique_base_close[snapshot_codes]
+    future_close = unique_future_close[snapshot_codes]
+    forward_returns = unique_forward_returns[snapshot_codes]
+    base_session_dates = _take_or_none(session_dates, unique_base_indices)[snapshot_codes]
+    future_session_dates = _take_or_none(session_dates, unique_future_indices)[snapshot_codes]
+    terms = snapshots_df["term"].to_numpy()
+
+    frames = []
+    for column, mapping in enumerate(SIGNAL_MAPPINGS):
+        rows = terms == mapping.term
+        if not rows.any():
+            continue
+        term_rows = snapshots_df[rows]
+        forward_return = forward_returns[rows, column]
+        frames.append(
+            pd.DataFrame(
                 {
-                    "snapshot_at": snapshot_at,
-                    "provider": snapshot.provider,
-                    "term": snapshot.term,
+                    "snapshot_at": snapshot_at[rows].array,
+                    "provider": term_rows["provider"].array,
+                    "term": term_rows["term"].array,
                     "signal_name": mapping.signal_name,
                     "horizon_label": mapping.horizon_label,
-                    "score": snapshot.score,
-                    "recommendation": snapshot.recommendation,
-                    "analysis": snapshot.analysis,
-                    "conclusion": snapshot.conclusion,
-                    "special": snapshot.special,
-                    "base_session_date": base_session_date,
-                    "future_session_date": future_session_date,
-                    "base_close": base_close,
-                    "future_close": future_close,
+                    "score": term_rows["score"].array,
+                    "recommendation": term_rows["recommendation"].array,
+                    "analysis": term_rows["analysis"].array,
+                    "conclusion": term_rows["conclusion"].array,
+                    "special": term_rows["special"].array,
+                    "base_session_date": base_session_dates[rows],
+                    "future_session_date": future_session_dates[rows, column],
+                    "base_close": base_close[rows, column],
+                    "future_close": future_close[rows, column],
                     "forward_return": forward_return,
-                    "label_available": forward_return is not None,
+                    "label_available": ~np.isnan(forward_return),
                 }
             )
-    signals = pd.DataFrame(rows)
-    if signals.empty:
+        )
+    if not frames:
         return pd.DataFrame(columns=SIGNAL_COLUMNS)
+    signals = pd.concat(frames, ignore_index=True)
     normalized_signals = signals[SIGNAL_COLUMNS].sort_values(["snapshot_at", "signal_name", "horizon_label"]).reset_index(drop=True)
     logger.info("Built %s signal row(s) across %s mapping(s)", len(normalized_signals), len(SIGNAL_MAPPINGS))
     return normalized_signals
@@ -173,6 +254,9 @@ def build_dashboard_summary(
             if key not in latest_lookup.index:
                 continue
             latest_row = latest_lookup.loc[key].to_dict()
+            if pd.isna(latest_row.get("recommendation")):
+                # Missing categorical values come back as NaN rather than None.
+                latest_row["recommendation"] = None
             evaluation_row = (
                 evaluation_lookup.loc[key].to_dict() if len(evaluation_lookup) and key in evaluation_lookup.index else {}
             )
@@ -245,6 +329,7 @@ def capture_latest_snapshot(config: AppConfig | None = None, upload_to_gcs: bool
     provider = InvesttechProvider(url=config.investtech_url)
     raw_snapshot = provider.build_raw_snapshot()
     local_path = write_local_raw_snapshot(config, raw_snapshot.provider, raw_snapshot.snapshot_at, raw_snapshot.payload)
+    snapshot_at = format_utc_timestamp(raw_snapshot.snapshot_at)
     blob_name = None
     if upload_to_gcs:
         blob_name = upload_raw_snapshot_to_gcs(
@@ -255,13 +340,13 @@ def capture_latest_snapshot(config: AppConfig | None = None, upload_to_gcs: bool
         )
     logger.info(
         "Latest snapshot capture complete: snapshot_at=%s local_path=%s uploaded=%s",
-        format_utc_timestamp(raw_snapshot.snapshot_at),
+        snapshot_at,
         local_path,
         bool(blob_name),
     )
     return {
         "provider": raw_snapshot.provider,
-        "snapshot_at": format_utc_timestamp(raw_snapshot.snapshot_at),
+        "snapshot_at": snapshot_at,
         "local_path": str(local_path),
         "gcs_blob": blob_name,
         "payload": raw_snapshot.payload,
@@ -289,7 +374,13 @@ def build_processed_artifacts(
             start_date,
             end_date,
         )
-        market_sessions = fetch_benchmark_history(config.benchmark_ticker, start_date, end_date)
+        market_sessions = fetch_benchmark_history(
+            config.benchmark_ticker,
+            start_date,
+            end_date,
+            cache_dir=config.cache_dir,
+        )
+    market_sessions = normalize_market_sessions(market_sessions)
     logger.info("Using %s benchmark session row(s)", len(market_sessions))
 
     signals_df = build_signal_frame(snapshots_df, market_sessions)
@@ -334,11 +425,11 @@ def build_processed_artifacts(
     )
     dashboard_summary = build_dashboard_summary(config, snapshots_df, signals_df, evaluation_df, warnings)
 
-    write_dataframe(processed_artifact_path(config, "snapshots.csv"), snapshots_df)
-    write_dataframe(processed_artifact_path(config, "signals.csv"), signals_df)
-    write_dataframe(processed_artifact_path(config, "evaluation.csv"), evaluation_df)
-    write_dataframe(processed_artifact_path(config, "calibration.csv"), calibration_df)
-    write_dataframe(processed_artifact_path(config, "strategies.csv"), strategies_df)
+    write_dataframe(processed_artifact_path(config, "snapshots.parquet"), snapshots_df)
+    write_dataframe(processed_artifact_path(config, "signals.parquet"), signals_df)
+    write_dataframe(processed_artifact_path(config, "evaluation.parquet"), evaluation_df)
+    write_dataframe(processed_artifact_path(config, "calibration.parquet"), calibration_df)
+    write_dataframe(processed_artifact_path(config, "strategies.parquet"), strategies_df)
     write_json(processed_artifact_path(config, "dashboard_summary.json"), dashboard_summary)
     logger.info(
         "Processed artifact build complete: snapshots=%s signals=%s evaluation=%s calibration=%s strategies=%s warnings=%s",
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+MAX_PLOT_POINTS = 5000
+
+
+def select_mapping_rows(df: pd.DataFrame, signal_name: str, horizon_label: str) -> pd.DataFrame:
+    return df[(df["signal_name"] == signal_name) & (df["horizon_label"] == horizon_label)].copy()
+
+
+def downsample_rows(df: pd.DataFrame, max_points: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    if len(df) <= max_points:
+        return df
+    positions = np.unique(np.linspace(0, len(df) - 1, max_points).round().astype(int))
+    return df.iloc[positions]
+
 
 def plot_strategy_curves(strategies_df: pd.DataFrame, signal_name: str, horizon_label: str):
     import matplotlib.pyplot as plt
 
-    subset = strategies_df[
-        (strategies_df["signal_name"] == signal_name) & (strategies_df["horizon_label"] == horizon_label)
-    ].copy()
+    subset = select_mapping_rows(strategies_df, signal_name, horizon_label)
     if subset.empty:
         return None
 
     x_axis = "trade_exit_date" if "trade_exit_date" in subset.columns and subset["trade_exit_date"].notna().any() else "snapshot_at"
-    subset = subset.sort_values(x_axis)
+    subset = downsample_rows(subset.sort_values(x_axis))
     fig, ax = plt.subplots(figsize=(10, 4.5))
     ax.plot(subset[x_axis], subset["cumulative_strategy_equity"], label="Strategy", linewidth=2)
     ax.plot(subset[x_axis], subset["cumulative_buy_hold_equity"], label="Buy & Hold", linewidth=2)
@@ -28,9 +40,7 @@ def plot_strategy_curves(strategies_df: pd.DataFrame, signal_name: str, horizon_
 def plot_calibration(calibration_df: pd.DataFrame, signal_name: str, horizon_label: str):
     import matplotlib.pyplot as plt
 
-    subset = calibration_df[
-        (calibration_df["signal_name"] == signal_name) & (calibration_df["horizon_label"] == horizon_label)
-    ].copy()
+    subset = select_mapping_rows(calibration_df, signal_name, horizon_label)
     if subset.empty:
         return None
 
@@ -55,13 +65,15 @@ def plot_calibration(calibration_df: pd.DataFrame, signal_name: str, horizon_lab
 def plot_threshold_history(strategies_df: pd.DataFrame, signal_name: str, horizon_label: str):
     import matplotlib.pyplot as plt
 
-    subset = strategies_df[
-        (strategies_df["signal_name"] == signal_name) & (strategies_df["horizon_label"] == horizon_label)
-    ].copy()
+    subset = select_mapping_rows(strategies_df, signal_name, horizon_label)
     if subset.empty:
         return None
 
     subset = subset.sort_values("snapshot_at")
+    # A post-step line only needs the rows where the threshold changes, plus the final row.
+    changes = subset["threshold"].ne(subset["threshold"].shift()).to_numpy()
+    changes[-1] = True
+    subset = subset[changes]
     fig, ax = plt.subplots(figsize=(10, 3.8))
     ax.step(subset["snapshot_at"], subset["threshold"], where="post", linewidth=2, color="#2F4858")
     ax.set_title(f"{signal_name} -> {horizon_label} selected threshold")
@@ -3,10 +3,11 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from html import unescape
 
 import requests
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, Comment, SoupStrainer, Tag
 
 from ..constants import PROVIDER_NAME, RAW_TERM_KEYS
 from ..storage import format_utc_timestamp
@@ -26,73 +27,97 @@ SPECIAL_MARKERS = {
 CONCLUSION_MARKERS = ("techConclusionStart", "techConclusionEnd")
 
 
+def _comment_block_pattern(marker_start: str, marker_end: str) -> re.Pattern[str]:
+    return re.compile(rf"<!--\s*{re.escape(marker_start)}\s*-->(.*?)<!--\s*{re.escape(marker_end)}\s*-->", re.S)
+
+
+COMMENT_BLOCK_PATTERNS = {
+    markers: _comment_block_pattern(*markers) for markers in (*SPECIAL_MARKERS.values(), CONCLUSION_MARKERS)
+}
+WHITESPACE_PATTERN = re.compile(r"\s+")
+SCORE_PATTERN = re.compile(r"Score:\s*([-+]?\d+)")
+EVALUATION_SPAN_ID_PATTERN = re.compile(r".*CommentaryEvaluation")
+TERM_BLOCK_CLASS = "cr_oneColWith20pctMargins"
+
+
+def _has_term_block_class(value: str | None) -> bool:
+    # SoupStrainer sees the raw class attribute, so multi-class values need splitting here.
+    return value is not None and TERM_BLOCK_CLASS in value.split()
+
+
+TERM_BLOCK_STRAINER = SoupStrainer("div", class_=_has_term_block_class)
+
+
+def _normalize_text(text: str) -> str | None:
+    text = unescape(WHITESPACE_PATTERN.sub(" ", text)).strip()
+    return text or None
+
+
 def _clean_text(fragment: str | None) -> str | None:
     if not fragment:
         return None
-    soup = BeautifulSoup(fragment, "html.parser")
-    text = soup.get_text(" ", strip=True)
-    text = unescape(re.sub(r"\s+", " ", text)).strip()
-    return text or None
+    return _normalize_text(BeautifulSoup(fragment, "html.parser").get_text(" ", strip=True))
 
 
 def _extract_comment_block(html_fragment: str, marker_start: str, marker_end: str) -> str | None:
-    pattern = rf"<!--\s*{re.escape(marker_start)}\s*-->(.*?)<!--\s*{re.escape(marker_end)}\s*-->"
-    match = re.search(pattern, html_fragment, re.S)
+    match = COMMENT_BLOCK_PATTERNS[(marker_start, marker_end)].search(html_fragment)
     return _clean_text(match.group(1)) if match else None
 
 
 def _strip_comment_blocks(html_fragment: str, term: str) -> str:
-    patterns = [
-        rf"<!--\s*{CONCLUSION_MARKERS[0]}\s*-->(.*?)<!--\s*{CONCLUSION_MARKERS[1]}\s*-->",
-    ]
+    patterns = [COMMENT_BLOCK_PATTERNS[CONCLUSION_MARKERS]]
     if term in SPECIAL_MARKERS:
-        marker_start, marker_end = SPECIAL_MARKERS[term]
-        patterns.append(rf"<!--\s*{re.escape(marker_start)}\s*-->(.*?)<!--\s*{re.escape(marker_end)}\s*-->")
+        patterns.append(COMMENT_BLOCK_PATTERNS[SPECIAL_MARKERS[term]])
     stripped = html_fragment
     for pattern in patterns:
-        stripped = re.sub(pattern, "", stripped, flags=re.S)
+        stripped = pattern.sub("", stripped)
     return stripped
 
 
-def parse_term_block(container: BeautifulSoup, term: str) -> dict | None:
-    term_name = TERM_LABELS[term]
-    for div in container.find_all("div", class_="cr_oneColWith20pctMargins"):
+def index_term_blocks(container: BeautifulSoup) -> dict[str, Tag]:
+    blocks: dict[str, Tag] = {}
+    for div in container.find_all("div", class_=TERM_BLOCK_CLASS):
         heading = div.find("h2")
-        if not heading or heading.get_text(strip=True) != term_name:
-            continue
-
-        html_fragment = str(div)
-        analysis_soup = BeautifulSoup(_strip_comment_blocks(html_fragment, term), "html.parser")
-        for tag in analysis_soup.find_all(["h2", "h3"]):
-            tag.decompose()
-        for comment in analysis_soup.find_all(string=lambda value: isinstance(value, Comment)):
-            comment.extract()
-        analysis = _clean_text(str(analysis_soup))
-
-        recommendation = None
-        score = None
-        heading_block = div.find("h3")
-        if heading_block:
-            score_match = re.search(r"Score:\s*([-+]?\d+)", heading_block.get_text(" ", strip=True))
-            score = int(score_match.group(1)) if score_match else None
-            recommendation_span = heading_block.find("span", id=re.compile(r".*CommentaryEvaluation"))
-            if recommendation_span:
-                recommendation = _clean_text(str(recommendation_span))
-
-        special = None
-        if term in SPECIAL_MARKERS:
-            marker_start, marker_end = SPECIAL_MARKERS[term]
-            special = _extract_comment_block(html_fragment, marker_start, marker_end)
-        conclusion = _extract_comment_block(html_fragment, *CONCLUSION_MARKERS)
-
-        return {
-            "analysis": analysis,
-            "special": special,
-            "conclusion": conclusion,
-            "recommendation": recommendation,
-            "score": score,
-        }
-    return None
+        if heading:
+            blocks.setdefault(heading.get_text(strip=True), div)
+    return blocks
+
+
+def parse_term_block(div: Tag | None, term: str) -> dict | None:
+    if div is None:
+        return None
+
+    html_fragment = str(div)
+    analysis_soup = BeautifulSoup(_strip_comment_blocks(html_fragment, term), "html.parser")
+    for tag in analysis_soup.find_all(["h2", "h3"]):
+        tag.decompose()
+    for comment in analysis_soup.find_all(string=lambda value: isinstance(value, Comment)):
+        comment.extract()
+    analysis = _normalize_text(analysis_soup.get_text(" ", strip=True))
+
+    recommendation = None
+    score = None
+    heading_block = div.find("h3")
+    if heading_block:
+        score_match = SCORE_PATTERN.search(heading_block.get_text(" ", strip=True))
+        score = int(score_match.group(1)) if score_match else None
+        recommendation_span = heading_block.find("span", id=EVALUATION_SPAN_ID_PATTERN)
+        if recommendation_span:
+            recommendation = _normalize_text(recommendation_span.get_text(" ", strip=True))
+
+    special = None
+    if term in SPECIAL_MARKERS:
+        marker_start, marker_end = SPECIAL_MARKERS[term]
+        special = _extract_comment_block(html_fragment, marker_start, marker_end)
+    conclusion = _extract_comment_block(html_fragment, *CONCLUSION_MARKERS)
+
+    return {
+        "analysis": analysis,
+        "special": special,
+        "conclusion": conclusion,
+        "recommendation": recommendation,
+        "score": score,
+    }
 
 
 def parse_investtech_html(html: str, snapshot_at: datetime | None = None) -> RawSnapshot:
@@ -102,16 +127,22 @@ def parse_investtech_html(html: str, snapshot_at: datetime | None = None) -> Raw
     else:
         snapshot_at = snapshot_at.astimezone(timezone.utc)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "html.parser", parse_only=TERM_BLOCK_STRAINER)
+    blocks = index_term_blocks(soup)
     payload = {
         "datetime": format_utc_timestamp(snapshot_at),
-        RAW_TERM_KEYS["short"]: parse_term_block(soup, "short"),
-        RAW_TERM_KEYS["medium"]: parse_term_block(soup, "medium"),
-        RAW_TERM_KEYS["long"]: parse_term_block(soup, "long"),
+        RAW_TERM_KEYS["short"]: parse_term_block(blocks.get(TERM_LABELS["short"]), "short"),
+        RAW_TERM_KEYS["medium"]: parse_term_block(blocks.get(TERM_LABELS["medium"]), "medium"),
+        RAW_TERM_KEYS["long"]: parse_term_block(blocks.get(TERM_LABELS["long"]), "long"),
     }
     return RawSnapshot(provider=PROVIDER_NAME, snapshot_at=snapshot_at, payload=payload)
 
 
+@lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    return requests.Session()
+
+
 @dataclass
 class InvesttechProvider:
     url: str
@@ -119,7 +150,7 @@ class InvesttechProvider:
     name: str = PROVIDER_NAME
 
     def fetch_html(self) -> str:
-        response = requests.get(self.url, timeout=self.timeout_seconds)
+        response = _http_session().get(self.url, timeout=self.timeout_seconds)
         response.raise_for_status()
         return response.text
 
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 import pandas as pd
 
 from .config import AppConfig
@@ -13,35 +17,36 @@ from .config import AppConfig
 logger = logging.getLogger(__name__)
 
 
+RAW_SNAPSHOT_READ_WORKERS = 8
+GCS_DOWNLOAD_WORKERS = 16
+
 ARTIFACT_NAMES = (
-    "snapshots.csv",
-    "signals.csv",
-    "evaluation.csv",
-    "calibration.csv",
-    "strategies.csv",
+    "snapshots.parquet",
+    "signals.parquet",
+    "evaluation.parquet",
+    "calibration.parquet",
+    "strategies.parquet",
     "dashboard_summary.json",
 )
 
+LEGACY_CSV_DATE_COLUMNS = {
+    "snapshots.parquet": ["snapshot_at"],
+    "signals.parquet": ["snapshot_at"],
+    "strategies.parquet": ["snapshot_at", "trade_entry_date", "trade_exit_date"],
+}
+
 
 def ensure_directories(config: AppConfig) -> None:
     config.raw_dir.mkdir(parents=True, exist_ok=True)
     config.processed_dir.mkdir(parents=True, exist_ok=True)
 
 
-def parse_utc_timestamp(value: str) -> datetime:
-    cleaned = value.replace("Z", "+00:00")
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        return parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
-
-
 def format_utc_timestamp(value: datetime) -> str:
     if value.tzinfo is None:
         value = value.replace(tzinfo=timezone.utc)
     else:
         value = value.astimezone(timezone.utc)
-    return value.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    return f"{value:%Y-%m-%dT%H:%M:%SZ}"
 
 
 def raw_snapshot_filename(provider: str, snapshot_at: datetime) -> str:
@@ -68,14 +73,26 @@ def bootstrap_legacy_raw_history(config: AppConfig) -> int:
     return copied
 
 
+def _encode_raw_snapshot(payload: dict) -> bytes:
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+
+
 def write_local_raw_snapshot(config: AppConfig, provider: str, snapshot_at: datetime, payload: dict) -> Path:
     ensure_directories(config)
     path = config.raw_dir / raw_snapshot_filename(provider, snapshot_at)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_bytes(_encode_raw_snapshot(payload))
     logger.info("Wrote raw snapshot to %s", path)
     return path
 
 
+@lru_cache(maxsize=None)
+def gcs_client(project: str):
+    from google.cloud import storage
+
+    # Shared per project so warm processes reuse auth tokens and pooled connections.
+    return storage.Client(project=project)
+
+
 def upload_raw_snapshot_to_gcs(
     config: AppConfig,
     provider: str,
@@ -84,23 +101,24 @@ def upload_raw_snapshot_to_gcs(
     client=None,
 ) -> str:
     if client is None:
-        from google.cloud import storage
-
-        client = storage.Client(project=config.gcs_project)
+        client = gcs_client(config.gcs_project)
     bucket = client.bucket(config.gcs_bucket)
     blob_name = f"{config.raw_gcs_prefix.rstrip('/')}/{raw_snapshot_filename(provider, snapshot_at)}"
     blob = bucket.blob(blob_name)
-    blob.upload_from_string(json.dumps(payload, ensure_ascii=False, indent=2), content_type="application/json")
+    blob.upload_from_string(_encode_raw_snapshot(payload), content_type="application/json")
     logger.info("Uploaded raw snapshot to gs://%s/%s", config.gcs_bucket, blob_name)
     return blob_name
 
 
+def _download_blob(blob, destination: Path) -> None:
+    blob.download_to_filename(destination)
+    logger.debug("Downloaded %s to %s", blob.name, destination)
+
+
 def sync_raw_snapshots_from_gcs(config: AppConfig, client=None) -> dict:
     ensure_directories(config)
     if client is None:
-        from google.cloud import storage
-
-        client = storage.Client(project=config.gcs_project)
+        client = gcs_client(config.gcs_project)
     bucket = client.bucket(config.gcs_bucket)
     logger.info(
         "Syncing raw snapshots from gs://%s into %s",
@@ -108,25 +126,27 @@ def sync_raw_snapshots_from_gcs(config: AppConfig, client=None) -> dict:
         config.raw_dir,
     )
 
-    downloaded = 0
     skipped = 0
     seen = set()
+    pending_blobs = []
+    destinations: list[Path] = []
     for prefix in (config.raw_gcs_prefix.rstrip("/"), "investtech_"):
         logger.debug("Listing blobs with prefix %s", prefix)
-        for blob in bucket.list_blobs(prefix=prefix):
-            if not blob.name.endswith(".json"):
-                continue
+        for blob in bucket.list_blobs(prefix=prefix, match_glob="**.json"):
             filename = Path(blob.name).name
             if filename in seen:
                 continue
             seen.add(filename)
             destination = config.raw_dir / filename
-            if destination.exists():
+            if destination.exists() and destination.stat().st_size == blob.size:
                 skipped += 1
                 continue
-            blob.download_to_filename(destination)
-            downloaded += 1
-            logger.debug("Downloaded %s to %s", blob.name, destination)
+            pending_blobs.append(blob)
+            destinations.append(destination)
+
+    with ThreadPoolExecutor(max_workers=GCS_DOWNLOAD_WORKERS) as executor:
+        list(executor.map(_download_blob, pending_blobs, destinations))
+    downloaded = len(pending_blobs)
 
     result = {"downloaded": downloaded, "skipped": skipped, "total_seen": len(seen)}
     logger.info(
@@ -138,57 +158,126 @@ def sync_raw_snapshots_from_gcs(config: AppConfig, client=None) -> dict:
     return result
 
 
-def load_raw_snapshot_payloads(config: AppConfig) -> list[tuple[Path, dict]]:
+def _read_raw_snapshot(path: Path) -> dict:
+    with path.open("rb") as handle:
+        return orjson.loads(handle.read())
+
+
+def list_raw_snapshot_paths(config: AppConfig) -> list[Path]:
     ensure_directories(config)
     bootstrap_legacy_raw_history(config)
-    payloads: list[tuple[Path, dict]] = []
-    for path in sorted(config.raw_dir.glob("*.json")):
-        with path.open("r", encoding="utf-8") as handle:
-            payloads.append((path, json.load(handle)))
+    with os.scandir(config.raw_dir) as entries:
+        return sorted(Path(entry.path) for entry in entries if entry.name.endswith(".json") and entry.is_file())
+
+
+def load_raw_snapshot_payloads(config: AppConfig, paths: list[Path] | None = None) -> list[tuple[Path, dict]]:
+    if paths is None:
+        paths = list_raw_snapshot_paths(config)
+    with ThreadPoolExecutor(max_workers=RAW_SNAPSHOT_READ_WORKERS) as executor:
+        payloads = list(zip(paths, executor.map(_read_raw_snapshot, paths)))
     logger.info("Loaded %s raw snapshot payload(s) from %s", len(payloads), config.raw_dir)
     return payloads
 
 
 def write_dataframe(path: Path, df: pd.DataFrame) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
     logger.info("Wrote %s row(s) to %s", len(df), path)
 
 
+def write_parquet_atomic(path: Path, df: pd.DataFrame, metadata: dict[bytes, bytes] | None = None) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and swap it in, so a crash or a concurrent build never leaves a truncated file.
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def read_parquet_with_metadata(path: Path) -> tuple[pd.DataFrame, dict[bytes, bytes]] | None:
+    import pyarrow.parquet as pq
+
+    try:
+        table = pq.read_table(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable Parquet cache %s: %s", path, exc)
+        return None
+    return table.to_pandas(), table.schema.metadata or {}
+
+
 def write_json(path: Path, payload: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     logger.info("Wrote JSON artifact to %s", path)
 
 
+def read_json(path: Path) -> dict:
+    content = path.read_bytes()
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # Summaries written by older builds may contain NaN literals, which orjson rejects.
+        return json.loads(content)
+
+
 def processed_artifact_path(config: AppConfig, name: str) -> Path:
     if name not in ARTIFACT_NAMES:
         raise ValueError(f"Unknown artifact: {name}")
     return config.processed_dir / name
 
 
+def _read_legacy_csv_artifact(legacy_path: Path, name: str) -> pd.DataFrame:
+    return pd.read_csv(legacy_path, parse_dates=LEGACY_CSV_DATE_COLUMNS.get(name))
+
+
+def _read_artifact_frame(path: Path) -> pd.DataFrame:
+    if path.exists():
+        return pd.read_parquet(path)
+    # Artifacts built before the Parquet switch are read as-is until `migrate-artifacts` or a rebuild replaces them.
+    legacy_path = path.with_suffix(".csv")
+    if legacy_path.exists():
+        return _read_legacy_csv_artifact(legacy_path, path.name)
+    return pd.DataFrame()
+
+
+def migrate_csv_artifacts(config: AppConfig) -> int:
+    migrated = 0
+    for name in ARTIFACT_NAMES:
+        path = config.processed_dir / name
+        legacy_path = path.with_suffix(".csv")
+        if path.suffix != ".parquet" or path.exists() or not legacy_path.exists():
+            continue
+        write_dataframe(path, _read_legacy_csv_artifact(legacy_path, name))
+        migrated += 1
+    if migrated:
+        logger.info("Migrated %s CSV artifact(s) to Parquet in %s", migrated, config.processed_dir)
+    return migrated
+
+
 def load_dashboard_bundle(config: AppConfig) -> dict:
     ensure_directories(config)
     bundle = {}
-    snapshots_path = processed_artifact_path(config, "snapshots.csv")
-    signals_path = processed_artifact_path(config, "signals.csv")
-    evaluation_path = processed_artifact_path(config, "evaluation.csv")
-    calibration_path = processed_artifact_path(config, "calibration.csv")
-    strategies_path = processed_artifact_path(config, "strategies.csv")
+    snapshots_path = processed_artifact_path(config, "snapshots.parquet")
+    signals_path = processed_artifact_path(config, "signals.parquet")
+    evaluation_path = processed_artifact_path(config, "evaluation.parquet")
+    calibration_path = processed_artifact_path(config, "calibration.parquet")
+    strategies_path = processed_artifact_path(config, "strategies.parquet")
     summary_path = processed_artifact_path(config, "dashboard_summary.json")
 
-    bundle["snapshots"] = (
-        pd.read_csv(snapshots_path, parse_dates=["snapshot_at"]) if snapshots_path.exists() else pd.DataFrame()
-    )
-    bundle["signals"] = pd.read_csv(signals_path, parse_dates=["snapshot_at"]) if signals_path.exists() else pd.DataFrame()
-    bundle["evaluation"] = pd.read_csv(evaluation_path) if evaluation_path.exists() else pd.DataFrame()
-    bundle["calibration"] = pd.read_csv(calibration_path) if calibration_path.exists() else pd.DataFrame()
-    bundle["strategies"] = (
-        pd.read_csv(strategies_path, parse_dates=["snapshot_at", "trade_entry_date", "trade_exit_date"])
-        if strategies_path.exists()
-        else pd.DataFrame()
-    )
-    bundle["summary"] = json.loads(summary_path.read_text(encoding="utf-8")) if summary_path.exists() else {}
+    bundle["snapshots"] = _read_artifact_frame(snapshots_path)
+    bundle["signals"] = _read_artifact_frame(signals_path)
+    bundle["evaluation"] = _read_artifact_frame(evaluation_path)
+    bundle["calibration"] = _read_artifact_frame(calibration_path)
+    bundle["strategies"] = _read_artifact_frame(strategies_path)
+    bundle["summary"] = read_json(summary_path) if summary_path.exists() else {}
     bundle["paths"] = {
         "snapshots": snapshots_path,
         "signals": signals_path,
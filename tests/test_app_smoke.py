@@ -15,6 +15,10 @@ class StreamlitStub:
     def __init__(self):
         self.calls = []
 
+    def cache_data(self, **kwargs):
+        self.calls.append(("cache_data", kwargs))
+        return lambda func: func
+
     def set_page_config(self, **kwargs):
         self.calls.append(("set_page_config", kwargs))
 
@@ -69,7 +73,7 @@ def test_app_renders_from_processed_artifacts_without_network(app_config, monkey
     build_processed_artifacts(app_config, market_sessions=market_sessions)
 
     monkeypatch.setenv("SP500_TECH_DATA_ROOT", str(app_config.data_root))
-    monkeypatch.setattr(requests, "get", _boom)
+    monkeypatch.setattr(requests.Session, "request", _boom)
 
     sys.modules.pop("sp500_tech_analyser.dashboard", None)
     app = importlib.import_module("sp500_tech_analyser.dashboard")
@@ -79,8 +83,10 @@ def test_app_renders_from_processed_artifacts_without_network(app_config, monkey
     monkeypatch.setattr(app, "plot_calibration", lambda *args, **kwargs: object())
     monkeypatch.setattr(app, "plot_threshold_history", lambda *args, **kwargs: object())
 
+    app.main()
     app.main()
 
+    assert sum(call[0] == "cache_data" for call in stub.calls) == 1
     assert ("title", "Investtech Decision Dashboard") in stub.calls
     assert not any(call[0] == "error" for call in stub.calls)
     assert any(call[0] == "pyplot" for call in stub.calls)
@@ -31,3 +31,24 @@ def test_parse_investtech_html_handles_missing_special_block():
     assert snapshot.payload["short_term"]["analysis"] == "Short analysis paragraph without special block."
     assert snapshot.payload["short_term"]["special"] is None
     assert snapshot.payload["short_term"]["conclusion"] == "Short conclusion text."
+
+
+def test_parse_investtech_html_finds_nested_multi_class_term_blocks():
+    html = """
+    <html><body>
+      <div class="cr_oneColWith20pctMargins"><h2>Navigation</h2></div>
+      <div class="wrapper">
+        <div class="cr_oneColWith20pctMargins highlighted">
+          <h2>Short term</h2>
+          <h3><span id="ShortCommentaryEvaluation">Positive &amp; rising</span> Score: 40</h3>
+          <p>Nested analysis.</p>
+        </div>
+      </div>
+    </body></html>
+    """
+    snapshot = parse_investtech_html(html, snapshot_at=datetime(2024, 1, 10, 13, 0, tzinfo=timezone.utc))
+
+    assert snapshot.payload["short_term"]["analysis"] == "Nested analysis."
+    assert snapshot.payload["short_term"]["recommendation"] == "Positive & rising"
+    assert snapshot.payload["short_term"]["score"] == 40
+    assert snapshot.payload["medium_term"] is None
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from sp500_tech_analyser import market
+
+
+class FakeHistory:
+    def __init__(self):
+        self.calls = []
+        self.factor = 1.0
+        self.last_session = None
+
+    def __call__(self, ticker, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        dates = [day.date() for day in pd.bdate_range(start_date, end_date, inclusive="left")]
+        if self.last_session is not None:
+            dates = [day for day in dates if day <= self.last_session]
+        closes = [self.factor * (100.0 + day.toordinal() % 7) for day in dates]
+        return pd.DataFrame({"session_date": dates, "close": closes})
+
+
+@pytest.fixture
+def fake_history(monkeypatch) -> FakeHistory:
+    history = FakeHistory()
+    monkeypatch.setattr(market, "_download_benchmark_history", history)
+    return history
+
+
+def test_fetch_benchmark_history_reuses_cache_and_only_downloads_tail(tmp_path, fake_history):
+    first = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+    second = market.fetch_benchmark_history("^GSPC", date(2024, 1, 10), date(2024, 2, 29), cache_dir=tmp_path)
+
+    assert fake_history.calls == [(date(2024, 1, 1), date(2024, 2, 2)), (date(2024, 1, 31), date(2024, 3, 2))]
+    assert market.benchmark_cache_path(tmp_path, "^GSPC").exists()
+    assert first["session_date"].iloc[-1] == date(2024, 2, 1)
+    assert second["session_date"].iloc[0] == date(2024, 1, 10)
+    assert second["session_date"].is_unique
+    assert second["session_date"].iloc[-1] == date(2024, 3, 1)
+
+
+def test_fetch_benchmark_history_skips_download_when_cache_is_current(tmp_path, fake_history):
+    first = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+    second = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+
+    assert fake_history.calls == [(date(2024, 1, 1), date(2024, 2, 2))]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_fetch_benchmark_history_keeps_cache_when_tail_has_no_new_sessions(tmp_path, fake_history):
+    market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+    cache_path = market.benchmark_cache_path(tmp_path, "^GSPC")
+    written_at = cache_path.stat().st_mtime_ns
+    fake_history.last_session = date(2024, 2, 1)
+
+    sessions = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 2, 29), cache_dir=tmp_path)
+
+    assert fake_history.calls == [(date(2024, 1, 1), date(2024, 2, 2)), (date(2024, 1, 31), date(2024, 3, 2))]
+    assert cache_path.stat().st_mtime_ns == written_at
+    assert sessions["session_date"].iloc[-1] == date(2024, 2, 1)
+
+
+def test_fetch_benchmark_history_reuses_cache_for_weekend_start_date(tmp_path, fake_history):
+    saturday = date(2024, 1, 6)
+
+    market.fetch_benchmark_history("^GSPC", saturday, date(2024, 1, 31), cache_dir=tmp_path)
+    market.fetch_benchmark_history("^GSPC", saturday, date(2024, 1, 31), cache_dir=tmp_path)
+    extended = market.fetch_benchmark_history("^GSPC", saturday, date(2024, 2, 29), cache_dir=tmp_path)
+
+    assert fake_history.calls == [(saturday, date(2024, 2, 2)), (date(2024, 1, 31), date(2024, 3, 2))]
+    assert extended["session_date"].iloc[0] == date(2024, 1, 8)
+
+
+def test_fetch_benchmark_history_treats_corrupt_cache_as_miss(tmp_path, fake_history):
+    cache_path = market.benchmark_cache_path(tmp_path, "^GSPC")
+    cache_path.write_bytes(b"PAR1 truncated")
+
+    sessions = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+
+    assert fake_history.calls == [(date(2024, 1, 1), date(2024, 2, 2))]
+    assert sessions["session_date"].iloc[-1] == date(2024, 2, 1)
+    assert pd.read_parquet(cache_path)["session_date"].iloc[-1] == date(2024, 2, 1)
+    assert list(tmp_path.iterdir()) == [cache_path]
+
+
+def test_fetch_benchmark_history_redownloads_when_adjusted_closes_rebase(tmp_path, fake_history):
+    market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 1, 31), cache_dir=tmp_path)
+    fake_history.factor = 0.99
+    sessions = market.fetch_benchmark_history("^GSPC", date(2024, 1, 1), date(2024, 2, 29), cache_dir=tmp_path)
+
+    assert fake_history.calls == [
+        (date(2024, 1, 1), date(2024, 2, 2)),
+        (date(2024, 1, 31), date(2024, 3, 2)),
+        (date(2024, 1, 1), date(2024, 3, 2)),
+    ]
+    expected = [0.99 * (100.0 + day.toordinal() % 7) for day in sessions["session_date"]]
+    assert sessions["close"].tolist() == pytest.approx(expected)
+
+
+def test_resolve_base_session_indices_leaves_missing_times_unresolved():
+    session_dates = [day.date() for day in pd.bdate_range("2024-01-08", periods=5)]
+    snapshot_at = pd.Series(pd.to_datetime(["2024-01-10T13:00:00Z", None, "2024-01-10T22:00:00Z"], utc=True))
+
+    indices = market.resolve_base_session_indices(snapshot_at, session_dates)
+
+    assert indices.tolist() == [1, -1, 2]
@@ -12,7 +12,7 @@ def _boom(*args, **kwargs):
 
 
 def test_importing_dashboard_entrypoints_has_no_network_side_effects(monkeypatch):
-    monkeypatch.setattr(requests, "get", _boom)
+    monkeypatch.setattr(requests.Session, "request", _boom)
     monkeypatch.setitem(sys.modules, "streamlit", types.SimpleNamespace())
 
     for module_name in ("app", "sp500_tech_analyser.dashboard", "sp500_tech_analyser.plotting"):
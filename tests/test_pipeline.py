@@ -4,13 +4,23 @@ import json
 from datetime import datetime, timedelta, timezone
 
 import pandas as pd
+import pytest
 
+from sp500_tech_analyser import pipeline, storage
 from sp500_tech_analyser.constants import SIGNAL_MAPPINGS
 from sp500_tech_analyser.evaluation import evaluate_signal_mapping
 from sp500_tech_analyser.pipeline import build_processed_artifacts, build_signal_frame, normalize_raw_snapshots
 from tests.conftest import make_market_sessions, make_snapshot_payload, write_raw_snapshot
 
 
+@pytest.fixture
+def parsed(monkeypatch) -> list[str]:
+    parsed_names = []
+    read_raw_snapshot = storage._read_raw_snapshot
+    monkeypatch.setattr(storage, "_read_raw_snapshot", lambda path: parsed_names.append(path.name) or read_raw_snapshot(path))
+    return parsed_names
+
+
 def test_normalize_raw_snapshots_dedupes_and_converts_to_utc(app_config):
     first_payload = make_snapshot_payload(
         datetime(2024, 1, 10, 11, 0, tzinfo=timezone.utc),
@@ -38,6 +48,79 @@ def test_normalize_raw_snapshots_dedupes_and_converts_to_utc(app_config):
     assert snapshots.loc[snapshots["term"] == "short", "score"].item() == 42
 
 
+def test_normalize_raw_snapshots_treats_offsetless_timestamps_as_utc(app_config):
+    with_offset = {
+        **make_snapshot_payload(datetime(2024, 1, 10, 11, 0, tzinfo=timezone.utc), 1, 1, 1),
+        "datetime": "2024-01-10T13:00:00+02:00",
+    }
+    without_offset = {
+        **make_snapshot_payload(datetime(2024, 1, 12, 13, 0, tzinfo=timezone.utc), 2, 2, 2),
+        "datetime": "2024-01-12T13:00:00",
+    }
+    write_raw_snapshot(app_config.raw_dir / "investtech_a.json", with_offset)
+    write_raw_snapshot(app_config.raw_dir / "investtech_b.json", without_offset)
+
+    snapshots = normalize_raw_snapshots(app_config)
+
+    assert snapshots["snapshot_at"].unique().tolist() == [
+        pd.Timestamp("2024-01-10T11:00:00Z"),
+        pd.Timestamp("2024-01-12T13:00:00Z"),
+    ]
+
+
+def test_normalize_raw_snapshots_only_parses_new_files_on_rerun(app_config, parsed):
+    for index in range(2):
+        payload = make_snapshot_payload(
+            datetime(2024, 1, 10 + index, 13, 0, tzinfo=timezone.utc),
+            short_score=index,
+            medium_score=index,
+            long_score=index,
+        )
+        write_raw_snapshot(app_config.raw_dir / f"investtech_{index}.json", payload)
+    normalize_raw_snapshots(app_config)
+
+    new_payload = make_snapshot_payload(datetime(2024, 1, 12, 13, 0, tzinfo=timezone.utc), 2, 2, 2)
+    write_raw_snapshot(app_config.raw_dir / "investtech_2.json", new_payload)
+    parsed.clear()
+
+    snapshots = normalize_raw_snapshots(app_config)
+
+    assert parsed == ["investtech_2.json"]
+    assert len(snapshots) == 9
+    assert snapshots.loc[snapshots["term"] == "short", "score"].tolist() == [0, 1, 2]
+    assert snapshots.loc[snapshots["term"] == "long", "special"].isna().all()
+
+
+def test_normalize_raw_snapshots_rebuilds_cache_after_version_change(app_config, monkeypatch, parsed):
+    for index in range(2):
+        payload = make_snapshot_payload(datetime(2024, 1, 10 + index, 13, 0, tzinfo=timezone.utc), 1, 1, 1)
+        write_raw_snapshot(app_config.raw_dir / f"investtech_{index}.json", payload)
+    normalize_raw_snapshots(app_config)
+
+    monkeypatch.setattr(pipeline, "RAW_SNAPSHOT_CACHE_VERSION", pipeline.RAW_SNAPSHOT_CACHE_VERSION + 1)
+    parsed.clear()
+
+    snapshots = normalize_raw_snapshots(app_config)
+
+    assert sorted(parsed) == ["investtech_0.json", "investtech_1.json"]
+    assert len(snapshots) == 6
+
+
+def test_normalize_raw_snapshots_reparses_when_cache_is_unreadable(app_config, parsed):
+    for index in range(2):
+        payload = make_snapshot_payload(datetime(2024, 1, 10 + index, 13, 0, tzinfo=timezone.utc), 1, 1, 1)
+        write_raw_snapshot(app_config.raw_dir / f"investtech_{index}.json", payload)
+    app_config.cache_dir.mkdir(parents=True, exist_ok=True)
+    (app_config.cache_dir / pipeline.RAW_SNAPSHOT_CACHE_NAME).write_bytes(b"PAR1 truncated")
+
+    snapshots = normalize_raw_snapshots(app_config)
+    parsed.clear()
+    normalize_raw_snapshots(app_config)
+
+    assert len(snapshots) == 6
+    assert parsed == []
+
+
 def test_build_signal_frame_only_uses_supported_signal_mappings(app_config):
     snapshot_times = [
         datetime(2024, 1, 10, 13, 0, tzinfo=timezone.utc),
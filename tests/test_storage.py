@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from fnmatch import fnmatch
+
+import pandas as pd
+
+from sp500_tech_analyser.storage import load_dashboard_bundle, migrate_csv_artifacts, sync_raw_snapshots_from_gcs
+
+
+def _write_legacy_strategies_csv(app_config):
+    app_config.processed_dir.mkdir(parents=True)
+    legacy_path = app_config.processed_dir / "strategies.csv"
+    pd.DataFrame(
+        {
+            "snapshot_at": ["2024-01-10T13:00:00Z"],
+            "signal_name": ["short_score"],
+            "trade_entry_date": ["2024-01-11"],
+            "trade_exit_date": ["2024-01-18"],
+            "threshold": [15],
+        }
+    ).to_csv(legacy_path, index=False)
+    return legacy_path
+
+
+def test_load_dashboard_bundle_reads_legacy_csv_artifacts_without_writing(app_config):
+    legacy_path = _write_legacy_strategies_csv(app_config)
+
+    bundle = load_dashboard_bundle(app_config)
+
+    assert legacy_path.exists()
+    assert not bundle["paths"]["strategies"].exists()
+    assert str(bundle["strategies"]["snapshot_at"].dtype) == "datetime64[ns, UTC]"
+    assert bundle["strategies"]["threshold"].item() == 15
+
+
+def test_migrate_csv_artifacts_writes_parquet_and_keeps_csv(app_config):
+    legacy_path = _write_legacy_strategies_csv(app_config)
+
+    assert migrate_csv_artifacts(app_config) == 1
+    assert migrate_csv_artifacts(app_config) == 0
+
+    bundle = load_dashboard_bundle(app_config)
+    assert legacy_path.exists()
+    assert bundle["paths"]["strategies"].exists()
+    assert str(bundle["strategies"]["snapshot_at"].dtype) == "datetime64[ns, UTC]"
+    assert bundle["strategies"]["threshold"].item() == 15
+
+
+class FakeBlob:
+    def __init__(self, name: str, content: bytes):
+        self.name = name
+        self.content = content
+        self.size = len(content)
+
+    def download_to_filename(self, destination):
+        destination.write_bytes(self.content)
+
+
+class FakeBucket:
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def list_blobs(self, prefix, match_glob):
+        return [blob for blob in self.blobs if blob.name.startswith(prefix) and fnmatch(blob.name, match_glob)]
+
+
+class FakeClient:
+    def __init__(self, blobs):
+        self.bucket_instance = FakeBucket(blobs)
+
+    def bucket(self, name):
+        return self.bucket_instance
+
+
+def test_sync_raw_snapshots_from_gcs_downloads_only_missing_or_partial_json(app_config):
+    app_config.raw_dir.mkdir(parents=True)
+    (app_config.raw_dir / "investtech_20240110T130000Z.json").write_bytes(b'{"local": 10}')
+    (app_config.raw_dir / "investtech_20240111T130000Z.json").write_bytes(b'{"day"')
+    client = FakeClient(
+        [
+            FakeBlob("data/raw/investtech/investtech_20240110T130000Z.json", b'{"stale": 10}'),
+            FakeBlob("data/raw/investtech/investtech_20240111T130000Z.json", b'{"day": 11}'),
+            FakeBlob("data/raw/investtech/notes.txt", b"ignored"),
+            FakeBlob("investtech_20240112T130000Z.json", b'{"day": 12}'),
+        ]
+    )
+
+    result = sync_raw_snapshots_from_gcs(app_config, client=client)
+
+    assert result == {"downloaded": 2, "skipped": 1, "total_seen": 3}
+    assert (app_config.raw_dir / "investtech_20240110T130000Z.json").read_bytes() == b'{"local": 10}'
+    assert (app_config.raw_dir / "investtech_20240111T130000Z.json").read_bytes() == b'{"day": 11}'
+    assert (app_config.raw_dir / "investtech_20240112T130000Z.json").read_bytes() == b'{"day": 12}'